@@ -73,6 +73,9 @@ if query:
                 "It does not provide medical advice, diagnosis, or treatment."
             )
 
+            with st.sidebar.expander("Pipeline stage counters"):
+                st.json(rag.stage_stats())
+
         except Exception as e:
             st.error(f"❌ Error processing query: {e}")
             st.exception(e)  # Show full traceback for debugging
\ No newline at end of file
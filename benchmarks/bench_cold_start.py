@@ -0,0 +1,64 @@
+"""
+Cold start: parsing data/ (loader + chunkers + tokenizer) vs the binary
+corpus artifact. Each path runs in a fresh interpreter so import cost
+(pandas in particular) is included. Model loading/encoding is identical
+for both paths and excluded.
+
+Run from the repo root (rebuilds the artifact first):
+    python -m benchmarks.bench_cold_start
+"""
+import os
+import subprocess
+import sys
+
+from src.corpus_store import CORPUS_PATH
+
+RUNS = 5
+
+SOURCE_PATH = """
+import sys, time
+t = time.perf_counter()
+from src.corpus_store import build_chunks
+from src.tokenizer import Tokenizer
+chunks = build_chunks()
+tok = Tokenizer()
+tokenized = [tok.encode(c["text"], grow=True) for c in chunks]
+print(time.perf_counter() - t, "pandas" in sys.modules)
+"""
+
+ARTIFACT_PATH = """
+import sys, time
+t = time.perf_counter()
+from src.corpus_store import load_corpus
+chunks, tok, tokenized = load_corpus(%r)
+print(time.perf_counter() - t, "pandas" in sys.modules)
+""" % CORPUS_PATH
+
+
+def run(code):
+    times = []
+    pandas_loaded = False
+    for _ in range(RUNS):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        times.append(float(out[-2]))
+        pandas_loaded = out[-1] == "True"
+    times.sort()
+    return times[len(times) // 2], pandas_loaded
+
+
+def main():
+    # Always rebuild: a stale mtime check would miss chunker/tokenizer changes,
+    # and load_corpus rejects an artifact whose pipeline fingerprint differs
+    subprocess.run([sys.executable, "-m", "src.corpus_store", "build"], check=True)
+
+    print(f"Artifact: {CORPUS_PATH} ({os.path.getsize(CORPUS_PATH)} bytes), median of {RUNS}")
+    for name, code in [("parse data/", SOURCE_PATH), ("artifact   ", ARTIFACT_PATH)]:
+        median, pandas_loaded = run(code)
+        print(f"{name}: {median * 1000:8.1f} ms   pandas imported: {pandas_loaded}")
+
+
+if __name__ == "__main__":
+    main()
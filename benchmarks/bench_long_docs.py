@@ -0,0 +1,121 @@
+"""
+Long-document chunking: whole H2 sections (previous behaviour) vs
+encoder-sized sliding windows.
+
+A synthetic clinical manual is built by concatenating every corpus
+section into a few very long H2 sections. For both splitters this reports
+chunk count, chunking time, how many word pieces the encoder actually sees
+versus silently truncates, and an estimated encoder FLOP count.
+
+With sentence-transformers installed, token counts come from the model's
+own tokenizer (so truncation of windows sized by estimate_tokens is really
+measured) and the encode() call is timed. Without it, counts fall back to
+estimate_tokens - the same estimator used for windowing - and are labelled
+as estimates.
+
+Run from the repo root:
+    python -m benchmarks.bench_long_docs [--sections 8] [--repeat 20]
+"""
+import argparse
+import os
+import time
+
+from src.chunking import (
+    ENCODER_MAX_TOKENS,
+    _chunk_markdown_sections,
+    estimate_tokens,
+    window_chunks,
+)
+
+DATA_DIR = "data"
+
+# all-MiniLM-L6-v2 encoder shape
+LAYERS = 6
+HIDDEN = 384
+FFN = 1536
+
+
+def encoder_flops(seq_len):
+    """Rough forward-pass FLOPs for one sequence (projections, FFN, attention)."""
+    per_layer = (
+        2 * seq_len * 4 * HIDDEN * HIDDEN +    # Q, K, V, output projections
+        2 * seq_len * 2 * HIDDEN * FFN +       # feed-forward
+        2 * 2 * seq_len * seq_len * HIDDEN     # attention scores + weighted sum
+    )
+    return LAYERS * per_layer
+
+
+def build_manual(n_sections, repeat):
+    with open(os.path.join(DATA_DIR, "dosha_guide_vata_pitta_kapha.md"), "r", encoding="utf-8") as f:
+        base = f.read()
+    bodies = []
+    for file in sorted(os.listdir(DATA_DIR)):
+        if file.endswith(".md"):
+            with open(os.path.join(DATA_DIR, file), "r", encoding="utf-8") as f:
+                bodies.append(f.read().replace("## ", "### "))
+    body = "\n\n".join(bodies)
+    sections = [f"## Chapter {i + 1}\n\n" + "\n\n".join([body] * repeat) for i in range(n_sections)]
+    return {
+        "doc_id": "clinical_manual.md",
+        "type": "markdown",
+        "text": base.split("\n## ")[0] + "\n\n" + "\n\n".join(sections),
+    }
+
+
+def token_counter(model):
+    """Token count including [CLS]/[SEP]: real tokenizer if available, else estimate."""
+    if model is None:
+        return lambda text: estimate_tokens(text) + 2
+    return lambda text: len(
+        model.tokenizer(text, add_special_tokens=True, truncation=False)["input_ids"]
+    )
+
+
+def report(name, chunks, elapsed, model=None):
+    count = token_counter(model)
+    seen = dropped = flops = over = 0
+    for c in chunks:
+        n = count(c["text"])
+        kept = min(n, ENCODER_MAX_TOKENS)
+        seen += kept
+        dropped += n - kept
+        over += n > ENCODER_MAX_TOKENS
+        flops += encoder_flops(kept)
+    line = (f"{name}: {len(chunks):5d} chunks  chunking {elapsed * 1000:7.1f} ms  "
+            f"encoded {seen:8d} tok  truncated {dropped:8d} tok in {over:5d} chunks  "
+            f"~{flops / 1e9:8.1f} GFLOPs")
+    if model is not None:
+        start = time.perf_counter()
+        model.encode([c["text"] for c in chunks], show_progress_bar=False)
+        line += f"  encode {time.perf_counter() - start:6.2f} s"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    doc = build_manual(args.sections, args.repeat)
+    print(f"Synthetic manual: {len(doc['text']):,} chars, ~{estimate_tokens(doc['text']):,} word pieces")
+
+    try:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer("all-MiniLM-L6-v2")
+    except ImportError:
+        print("sentence-transformers not installed - token counts are ESTIMATES "
+              "from the windowing estimator and cannot verify truncation")
+        model = None
+
+    start = time.perf_counter()
+    whole = _chunk_markdown_sections(doc)
+    report("H2 sections ", whole, time.perf_counter() - start, model)
+
+    start = time.perf_counter()
+    windowed = list(window_chunks(_chunk_markdown_sections(doc)))
+    report("windowed    ", windowed, time.perf_counter() - start, model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Replay a query log through HybridRetriever with and without the QueryCache.
+
+Run from the repo root:
+    python -m benchmarks.bench_query_cache [--log queries.txt] [--threshold 0.95]
+
+The log is one query per line; without --log a small built-in log of
+paraphrased questions is used.
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from src.query_cache import QueryCache
+from src.rag_engine import KeralaAyurvedaRAG
+
+DEFAULT_LOG = [
+    "what is vata",
+    "What is Vata?",
+    "what is vata?",
+    "explain vata dosha",
+    "What does Ayurveda mean by Vata, Pitta, and Kapha?",
+    "what does ayurveda mean by vata pitta and kapha",
+    "What are common signs of Vata imbalance?",
+    "signs of vata imbalance",
+    "What is Ashwagandha traditionally used for?",
+    "what is ashwagandha used for",
+    "How does Ayurveda view stress?",
+    "how does ayurveda view stress",
+    "Is Ayurveda safe to combine with modern medicine?",
+    "is ayurveda safe with modern medicine",
+    "What is Triphala?",
+    "what is triphala",
+]
+
+
+def replay(retriever, queries):
+    latencies = []
+    # retrieve() prints debug output per query
+    with contextlib.redirect_stdout(io.StringIO()):
+        for q in queries:
+            start = time.perf_counter()
+            retriever.retrieve(q)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def summarise(name, latencies):
+    latencies = sorted(latencies)
+    mean = sum(latencies) / len(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{name}: mean {mean * 1000:7.2f} ms   p95 {p95 * 1000:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--log")
+    parser.add_argument("--threshold", type=float, default=0.95)
+    parser.add_argument("--max-entries", type=int, default=512)
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log, "r", encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+    else:
+        queries = DEFAULT_LOG
+
+    retriever = KeralaAyurvedaRAG().retriever
+    print(f"Replaying {len(queries)} queries")
+
+    retriever.cache = QueryCache(max_entries=0)
+    summarise("no cache  ", replay(retriever, queries))
+
+    retriever.cache = QueryCache(args.max_entries, args.threshold)
+    summarise("two-tier  ", replay(retriever, queries))
+
+    for key, value in retriever.cache.stats().items():
+        print(f"  {key}: {value:.3f}" if isinstance(value, float) else f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Tokenizer throughput: legacy `text.lower().split()` vs src.tokenizer.
+
+Run from the repo root:
+    python -m benchmarks.bench_tokenizer
+"""
+import os
+import time
+
+from src.chunking import chunk_markdown_document
+from src.tokenizer import Tokenizer
+
+DATA_DIR = "data"
+REPEATS = 200
+
+QUERIES = [
+    "What does Ayurveda mean by Vata, Pitta, and Kapha?",
+    "What are common signs of Vata imbalance?",
+    "What is Ashwagandha traditionally used for?",
+    "Is Ayurveda safe to combine with modern medicine?",
+    "How does Ayurveda view stress?",
+]
+
+
+def load_chunk_texts():
+    texts = []
+    for file in sorted(os.listdir(DATA_DIR)):
+        if file.endswith(".md"):
+            with open(os.path.join(DATA_DIR, file), "r", encoding="utf-8") as f:
+                doc = {"doc_id": file, "type": "markdown", "text": f.read()}
+            texts.extend(c["text"] for c in chunk_markdown_document(doc))
+    return texts
+
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return time.perf_counter() - start
+
+
+def legacy_query(query):
+    # BM25 tokens + keyword set, as tokenized separately before
+    bm25_tokens = query.lower().split()
+    keywords = set(query.lower().split())
+    return bm25_tokens, keywords
+
+
+def main():
+    texts = load_chunk_texts()
+    n_tokens = sum(len(t.split()) for t in texts)
+    print(f"Corpus: {len(texts)} chunks, ~{n_tokens} whitespace tokens, {REPEATS} repeats")
+
+    # Index build
+    legacy = timed(lambda: [t.lower().split() for t in texts], REPEATS)
+
+    def build():
+        tok = Tokenizer()
+        return [tok.encode(t, grow=True) for t in texts]
+
+    shared = timed(build, REPEATS)
+    total = n_tokens * REPEATS
+    print(f"index  split(): {total / legacy:>12,.0f} tok/s")
+    print(f"index  shared : {total / shared:>12,.0f} tok/s")
+
+    # Query time
+    tok = Tokenizer()
+    for t in texts:
+        tok.encode(t, grow=True)
+    q_repeats = REPEATS * 50
+    legacy_q = timed(lambda: [legacy_query(q) for q in QUERIES], q_repeats)
+    shared_q = timed(lambda: [tok.analyze(q) for q in QUERIES], q_repeats)
+    n_q = len(QUERIES) * q_repeats
+    print(f"query  split(): {n_q / legacy_q:>12,.0f} queries/s")
+    print(f"query  shared : {n_q / shared_q:>12,.0f} queries/s")
+
+    # BM25 scoring on string tokens vs interned ids (needs rank_bm25)
+    try:
+        from rank_bm25 import BM25Okapi
+    except ImportError:
+        print("rank_bm25 not installed - skipping BM25 scoring comparison")
+        return
+
+    bm25_str = BM25Okapi([t.lower().split() for t in texts])
+    bm25_ids = BM25Okapi([tok.encode(t) for t in texts])
+    analyzed = [tok.analyze(q) for q in QUERIES]
+    str_t = timed(lambda: [bm25_str.get_scores(q.lower().split()) for q in QUERIES], REPEATS)
+    ids_t = timed(lambda: [bm25_ids.get_scores(a.ids) for a in analyzed], REPEATS)
+    n_s = len(QUERIES) * REPEATS
+    print(f"bm25   split(): {n_s / str_t:>12,.0f} scores/s")
+    print(f"bm25   ids    : {n_s / ids_t:>12,.0f} scores/s")
+
+
+if __name__ == "__main__":
+    main()
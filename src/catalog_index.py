@@ -0,0 +1,139 @@
+import re
+
+from src.tokenizer import Tokenizer, stem
+
+# Catalog columns kept in memory, one list per column
+COLUMNS = [
+    "product_id", "name", "category", "format", "target_concerns",
+    "key_herbs", "contains_animal_products", "contraindications_short",
+    "internal_tags"
+]
+
+# Attribute field -> catalog columns feeding its inverted index
+FIELDS = {
+    "herb": ["key_herbs"],
+    "concern": ["target_concerns", "internal_tags", "category"],
+}
+
+# Words in the herb column that are not herbs (stemmed, like index terms)
+_HERB_NOISE = {stem(w) for w in [
+    "other", "supportive", "supporting", "support", "herb", "herbs",
+    "root", "extract", "bitters"
+]}
+
+# Query words that only say "this is a product attribute lookup" (stemmed).
+# Every other content term must resolve to an attribute index.
+_CUE_TERMS = {stem(w) for w in [
+    "product", "products", "contain", "contains", "containing", "include",
+    "includes", "including", "ingredient", "ingredients", "made", "help",
+    "helps", "use", "used", "have", "has", "any", "there", "list", "catalog"
+]}
+
+# "with" can introduce either a herb ("with Amla") or a concern ("help with stress")
+_HERB_QUERY = re.compile(r"\b(contain|contains|containing|with|include|includes|including|ingredients?|made)\b")
+_CONCERN_QUERY = re.compile(r"\b(for|with|help|helps)\b")
+_PRODUCT_QUERY = re.compile(r"\bproducts?\b")
+
+# Negated or comparative questions are never answered by a lookup
+_NEGATION_QUERY = re.compile(r"\b(not|no|never|without|except|excluding|exclude|avoid|free)\b|n[\'’]t\b")
+_COMPARISON_QUERY = re.compile(
+    r"\b(compare|compared|comparing|comparison|versus|vs|better|best|worse|worst|"
+    r"difference|different|differ|instead|rather|than)\b"
+)
+
+
+class CatalogIndex:
+    """
+    Columnar in-memory view of products_catalog.csv with per-field
+    inverted indexes (herb term -> rows, concern term -> rows).
+    Answers attribute lookups such as "which products contain Brahmi"
+    without embedding retrieval.
+    """
+
+    def __init__(self, chunks):
+        # Catalog chunks as produced by chunk_csv_rows (or the corpus artifact)
+        self.chunks = [c for c in chunks if c["type"] == "product_catalog"]
+        self.columns = {col: [] for col in COLUMNS}
+        for chunk in self.chunks:
+            row = chunk.get("metadata", {})
+            for col in COLUMNS:
+                value = row.get(col)
+                self.columns[col].append(value if isinstance(value, str) else "")
+
+        self._tokenizer = Tokenizer()
+        self.indexes = {field: {} for field in FIELDS}
+        for field, cols in FIELDS.items():
+            index = self.indexes[field]
+            for col in cols:
+                for row_idx, value in enumerate(self.columns[col]):
+                    for term in self._terms(value):
+                        if field == "herb" and term in _HERB_NOISE:
+                            continue
+                        index.setdefault(term, set()).add(row_idx)
+
+    def _terms(self, text):
+        return [t for t in self._tokenizer.terms(self._tokenizer.tokens(text)) if len(t) > 1]
+
+    def match(self, query, terms=None):
+        """
+        Return matching row indexes for a recognised attribute query,
+        or None if the query is not one (caller falls back to retrieval).
+
+        Only fires when every content term of the query (anything that is
+        not a stop or cue word) resolves to an attribute index, and never
+        for negated or comparative questions - an unresolved term means
+        the lookup would answer a different question than was asked.
+        terms: pre-analyzed query terms (src.tokenizer), to avoid re-tokenizing.
+        """
+        q = query.lower()
+        if not self.chunks or not _PRODUCT_QUERY.search(q):
+            return None
+        if _NEGATION_QUERY.search(q) or _COMPARISON_QUERY.search(q):
+            return None
+
+        fields = []
+        if _HERB_QUERY.search(q):
+            fields.append("herb")
+        if _CONCERN_QUERY.search(q):
+            fields.append("concern")
+        if not fields:
+            return None
+
+        if terms is None:
+            terms = self._terms(query)
+        content = [t for t in terms if len(t) > 1 and t not in _CUE_TERMS]
+        if not content:
+            return None
+
+        rows = None
+        for term in content:
+            postings = set()
+            for field in fields:
+                postings |= self.indexes[field].get(term, set())
+            if not postings:
+                # Unresolved term - not a pure attribute lookup
+                return None
+            rows = postings if rows is None else rows & postings
+
+        # No product has every requested attribute
+        if not rows:
+            return None
+        return sorted(rows)
+
+    def answer(self, rows):
+        """Plain-language answer and citation chunks for matched rows."""
+        names = self.columns["name"]
+        categories = self.columns["category"]
+        notes = self.columns["contraindications_short"]
+
+        parts = []
+        for i in rows:
+            text = f"{names[i]} ({categories[i]})" if categories[i] else names[i]
+            if notes[i]:
+                text += f" - please note: {notes[i]}"
+            parts.append(text)
+
+        answer = "Matching products in the internal catalog: " + "; ".join(parts)
+        if not answer.endswith('.'):
+            answer += '.'
+        return answer, [self.chunks[i] for i in rows]
@@ -1,5 +1,141 @@
+import math
 import re
 
+# all-MiniLM-L6-v2 truncates inputs beyond 256 word pieces
+ENCODER_MAX_TOKENS = 256
+# [CLS] + [SEP]
+_SPECIAL_TOKENS = 2
+# Headroom for estimate_tokens under-counting the real tokenizer
+WINDOW_SAFETY_MARGIN = 0.10
+# Token overlap between consecutive windows of an oversized section
+WINDOW_OVERLAP_TOKENS = 32
+# A first line longer than this is prose, not a heading worth repeating
+HEADING_MAX_TOKENS = 32
+
+# Words and single punctuation/markup characters, roughly as WordPiece sees them
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text):
+    """
+    Conservative encoder word-piece count without loading the tokenizer.
+    Every punctuation/markup character (bullets, **, _) is one piece, and
+    long words - Sanskrit herb names in particular - split into several.
+    """
+    count = 0
+    for piece in _PIECE_RE.findall(text):
+        count += 1 if len(piece) <= 8 else math.ceil(len(piece) / 4)
+    return count
+
+
+def _split_long_word(word, budget, count_tokens):
+    """
+    Hard-split a whitespace-free token (URL, blob, long reference) into
+    character slices of at most `budget` tokens each.
+    """
+    while word:
+        # Longest prefix that still fits (at least one character)
+        lo, hi = 1, len(word)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if count_tokens(word[:mid]) <= budget:
+                lo = mid
+            else:
+                hi = mid - 1
+        yield word[:lo]
+        word = word[lo:]
+
+
+def _split_long_line(line, budget, count_tokens):
+    """Break a single line that alone exceeds the budget into word runs."""
+    run, run_cost = [], 0
+    for word in line.split():
+        cost = count_tokens(word)
+        if cost > budget:
+            if run:
+                yield " ".join(run)
+                run, run_cost = [], 0
+            yield from _split_long_word(word, budget, count_tokens)
+            continue
+        if run and run_cost + cost > budget:
+            yield " ".join(run)
+            run, run_cost = [], 0
+        run.append(word)
+        run_cost += cost
+    if run:
+        yield " ".join(run)
+
+
+def window_section(text, max_tokens=ENCODER_MAX_TOKENS, overlap=WINDOW_OVERLAP_TOKENS,
+                   count_tokens=estimate_tokens):
+    """
+    Split one section into overlapping windows that fit the encoder.
+    Windows break on line boundaries so bullets stay whole, and every
+    window after the first repeats the section heading (first line) when
+    the section has a short one. Sections that already fit are returned
+    unchanged as a single window; the result is never empty.
+    """
+    budget = int((max_tokens - _SPECIAL_TOKENS) * (1 - WINDOW_SAFETY_MARGIN))
+    if count_tokens(text) <= budget:
+        return [text]
+
+    heading, _, body = text.partition("\n")
+    heading = heading.strip()
+    heading_cost = count_tokens(heading)
+    if not body.strip() or heading_cost > HEADING_MAX_TOKENS:
+        # No heading to carry: window the whole text
+        heading, heading_cost, body = "", 0, text
+    body_budget = budget - heading_cost
+
+    lines = []
+    for line in body.splitlines():
+        if count_tokens(line) > body_budget:
+            lines.extend(_split_long_line(line, body_budget, count_tokens))
+        else:
+            lines.append(line)
+
+    windows = []
+    current, current_cost = [], 0
+    for line in lines:
+        cost = count_tokens(line)
+        if current and current_cost + cost > body_budget:
+            windows.append(current)
+            # Carry trailing lines (up to `overlap` tokens) into the next window
+            carry, carry_cost = [], 0
+            for prev in reversed(current):
+                prev_cost = count_tokens(prev)
+                if carry_cost + prev_cost > overlap:
+                    break
+                carry.insert(0, prev)
+                carry_cost += prev_cost
+            if carry_cost + cost > body_budget:
+                carry, carry_cost = [], 0
+            current, current_cost = carry, carry_cost
+        current.append(line)
+        current_cost += cost
+    if current:
+        windows.append(current)
+
+    windows = ["\n".join(w).strip() for w in windows]
+    windows = [heading + "\n" + w if heading else w for w in windows if w]
+    return windows or [text]
+
+
+def window_chunks(chunks, max_tokens=ENCODER_MAX_TOKENS, overlap=WINDOW_OVERLAP_TOKENS,
+                  count_tokens=estimate_tokens):
+    """
+    Lazily split oversized chunks into encoder-sized windows.
+    Chunks that fit keep their section_id; windows of an oversized chunk
+    get section_id suffixes _w1, _w2, ... so ids stay stable across rebuilds.
+    """
+    for chunk in chunks:
+        windows = window_section(chunk["text"], max_tokens, overlap, count_tokens)
+        if len(windows) == 1:
+            yield chunk
+            continue
+        for i, w in enumerate(windows, 1):
+            yield {**chunk, "section_id": f"{chunk['section_id']}_w{i}", "text": w}
+
 
 def chunk_foundation(text):
     """
@@ -77,6 +213,14 @@ def chunk_product_dossier(text):
 
 
 def chunk_markdown_document(doc):
+    """
+    Route to appropriate chunking strategy based on document type,
+    then window any section longer than the encoder's max sequence length.
+    """
+    return list(window_chunks(_chunk_markdown_sections(doc)))
+
+
+def _chunk_markdown_sections(doc):
     """
     Route to appropriate chunking strategy based on document type.
     """
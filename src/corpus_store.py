@@ -0,0 +1,282 @@
+"""
+Binary corpus artifact.
+
+Build once offline (parses markdown/CSV, runs the chunkers and tokenizer):
+    python -m src.corpus_store build
+
+Serving processes load the artifact instead, so they never import pandas
+or run the regex chunkers. The file is read in one pass and decoded into
+plain Python objects: BM25 and the encoder need every text and token list
+in memory anyway, so nothing stays backed by the file.
+
+The header carries a fingerprint of the chunker/loader/tokenizer code and
+the list of source files; an artifact built by different code or from a
+different set of data/ files is rejected and the caller falls back to
+parsing data/.
+
+Layout (little-endian):
+    header   magic, version, flags, pipeline fingerprint,
+             chunk count, section offsets/sizes
+    records  one fixed-size record per chunk (offsets into the heap/tokens)
+    types    newline-joined chunk type names
+    vocab    newline-joined terms, line number == term id
+    tokens   uint32 term ids for every chunk, concatenated
+    heap     UTF-8 strings (doc_ids, section_ids, texts, JSON metadata)
+"""
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+
+from src.tokenizer import Tokenizer
+
+CORPUS_PATH = os.path.join("build", "corpus.kac")
+DATA_DIR = "data"
+
+MAGIC = b"KACORP\x00\x00"
+FORMAT_VERSION = 2
+
+# Modules whose behaviour determines the chunks and token ids
+_PIPELINE_SOURCES = ["loader.py", "chunking.py", "tokenizer.py"]
+
+# magic, version, flags, fingerprint,
+# n_chunks, records_off, types_off, types_len, vocab_off, vocab_len,
+# tokens_off, tokens_count, heap_off, heap_len
+_HEADER = struct.Struct("<8sHH16sIIIIIIIIII")
+
+# doc_id, section_id, text, metadata: (offset, length) into heap;
+# type index; tokens: (offset, count) into the token array
+_RECORD = struct.Struct("<IIIIIIIIHII")
+
+_NO_METADATA = 0xFFFFFFFF
+
+
+def _source_files(data_dir=DATA_DIR):
+    return sorted(f for f in os.listdir(data_dir) if f.endswith((".md", ".csv")))
+
+
+def pipeline_fingerprint(data_dir=DATA_DIR):
+    """
+    Digest of the chunking pipeline code plus the names of the source files.
+    Changes to file contents are caught by is_fresh() via mtimes.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in _PIPELINE_SOURCES:
+        with open(os.path.join(src_dir, name), "rb") as f:
+            h.update(name.encode("utf-8") + b"\0" + f.read() + b"\0")
+    h.update("\n".join(_source_files(data_dir)).encode("utf-8"))
+    return h.digest()
+
+
+def build_chunks():
+    """Parse source documents and run the chunkers (offline / fallback path)."""
+    from src.loader import iter_markdown_files, load_product_catalog
+    from src.chunking import chunk_markdown_document, chunk_csv_rows
+
+    # Stream documents so only one source text is held at a time
+    chunks = []
+    for doc in iter_markdown_files():
+        chunks.extend(chunk_markdown_document(doc))
+    chunks.extend(chunk_csv_rows(load_product_catalog()))
+    return chunks
+
+
+def write_corpus(chunks, path=CORPUS_PATH):
+    """Tokenize chunks and write the binary artifact to path."""
+    tokenizer = Tokenizer()
+    heap = bytearray()
+    interned = {}
+
+    def put(s):
+        # Repeated strings (doc_ids mostly) are stored once
+        if s not in interned:
+            data = s.encode("utf-8")
+            interned[s] = (len(heap), len(data))
+            heap.extend(data)
+        return interned[s]
+
+    types = []
+    tokens = array("I")
+    records = bytearray()
+
+    for chunk in chunks:
+        if chunk["type"] not in types:
+            types.append(chunk["type"])
+
+        ids = tokenizer.encode(chunk["text"], grow=True)
+        tok_off = len(tokens)
+        tokens.extend(ids)
+
+        if "metadata" in chunk:
+            meta = put(json.dumps(chunk["metadata"], default=str))
+        else:
+            meta = (_NO_METADATA, 0)
+
+        records.extend(_RECORD.pack(
+            *put(chunk["doc_id"]),
+            *put(chunk["section_id"]),
+            *put(chunk["text"]),
+            *meta,
+            types.index(chunk["type"]),
+            tok_off, len(ids)
+        ))
+
+    if sys.byteorder != "little":
+        tokens.byteswap()
+
+    types_blob = "\n".join(types).encode("utf-8")
+    vocab_blob = "\n".join(tokenizer.terms_by_id()).encode("utf-8")
+    tokens_blob = tokens.tobytes()
+
+    records_off = _HEADER.size
+    types_off = records_off + len(records)
+    vocab_off = types_off + len(types_blob)
+    # Keep the token array 4-byte aligned
+    tokens_off = (vocab_off + len(vocab_blob) + 3) & ~3
+    pad = tokens_off - (vocab_off + len(vocab_blob))
+    heap_off = tokens_off + len(tokens_blob)
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, pipeline_fingerprint(),
+        len(chunks), records_off,
+        types_off, len(types_blob),
+        vocab_off, len(vocab_blob),
+        tokens_off, len(tokens),
+        heap_off, len(heap)
+    )
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(records)
+        f.write(types_blob)
+        f.write(vocab_blob)
+        f.write(b"\x00" * pad)
+        f.write(tokens_blob)
+        f.write(heap)
+    os.replace(tmp, path)
+
+    return len(chunks), len(tokenizer.vocab)
+
+
+def load_corpus(path=CORPUS_PATH):
+    """
+    Read an artifact written by write_corpus().
+    Returns (chunks, tokenizer, tokenized_corpus) ready for HybridRetriever.
+    Raises ValueError if the file is not a corpus artifact of this version,
+    is truncated or corrupt, or was built by a different chunking pipeline /
+    set of source files.
+    """
+    with open(path, "rb") as f:
+        buf = memoryview(f.read())
+
+    if len(buf) < _HEADER.size:
+        raise ValueError(f"{path}: truncated corpus artifact")
+
+    (magic, version, _flags, fingerprint, n_chunks, records_off,
+     types_off, types_len, vocab_off, vocab_len,
+     tokens_off, tokens_count, heap_off, heap_len) = _HEADER.unpack_from(buf, 0)
+
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a corpus artifact")
+    if version != FORMAT_VERSION:
+        raise ValueError(
+            f"{path}: corpus format v{version}, expected v{FORMAT_VERSION}"
+        )
+    if fingerprint != pipeline_fingerprint():
+        raise ValueError(
+            f"{path}: built by a different chunking pipeline or data/ file set"
+        )
+
+    # Every section must lie inside the file before anything is decoded
+    sections = [
+        ("records", records_off, n_chunks * _RECORD.size),
+        ("types", types_off, types_len),
+        ("vocab", vocab_off, vocab_len),
+        ("tokens", tokens_off, tokens_count * 4),
+        ("heap", heap_off, heap_len),
+    ]
+    for name, off, size in sections:
+        if off < _HEADER.size or off + size > len(buf):
+            raise ValueError(f"{path}: {name} section out of bounds (truncated or corrupt)")
+
+    try:
+        return _decode_sections(
+            buf, n_chunks, records_off, types_off, types_len,
+            vocab_off, vocab_len, tokens_off, tokens_count, heap_off, heap_len
+        )
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"{path}: corrupt corpus artifact ({e})") from e
+
+
+def _decode_sections(buf, n_chunks, records_off, types_off, types_len,
+                     vocab_off, vocab_len, tokens_off, tokens_count, heap_off, heap_len):
+    """Decode a bounds-checked artifact; raises IndexError on bad record offsets."""
+    types = bytes(buf[types_off:types_off + types_len]).decode("utf-8").split("\n")
+    vocab_blob = bytes(buf[vocab_off:vocab_off + vocab_len]).decode("utf-8")
+    tokenizer = Tokenizer(vocab_blob.split("\n") if vocab_blob else [])
+
+    token_ids = array("I")
+    token_ids.frombytes(buf[tokens_off:tokens_off + tokens_count * 4])
+    if sys.byteorder != "little":
+        token_ids.byteswap()
+
+    heap = buf[heap_off:heap_off + heap_len]
+
+    def get(off, length):
+        if off + length > heap_len:
+            raise IndexError(f"string at {off}+{length} outside heap")
+        return str(heap[off:off + length], "utf-8")
+
+    chunks = []
+    tokenized_corpus = []
+    for i in range(n_chunks):
+        (doc_off, doc_len, sec_off, sec_len, text_off, text_len,
+         meta_off, meta_len, type_idx, tok_off, tok_len) = _RECORD.unpack_from(
+            buf, records_off + i * _RECORD.size
+        )
+        if tok_off + tok_len > tokens_count:
+            raise IndexError(f"chunk {i} token ids outside token array")
+        chunk = {
+            "doc_id": get(doc_off, doc_len),
+            "section_id": get(sec_off, sec_len),
+            "text": get(text_off, text_len),
+            "type": types[type_idx]
+        }
+        if meta_off != _NO_METADATA:
+            chunk["metadata"] = json.loads(get(meta_off, meta_len))
+        chunks.append(chunk)
+        tokenized_corpus.append(token_ids[tok_off:tok_off + tok_len].tolist())
+
+    return chunks, tokenizer, tokenized_corpus
+
+
+def is_fresh(path=CORPUS_PATH, data_dir=DATA_DIR):
+    """
+    True if the artifact exists and is newer than every source file.
+    Added/removed files and code changes are checked by load_corpus().
+    """
+    if not os.path.exists(path):
+        return False
+    built = os.path.getmtime(path)
+    for file in _source_files(data_dir):
+        if os.path.getmtime(os.path.join(data_dir, file)) > built:
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the binary corpus artifact.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--out", default=CORPUS_PATH)
+    args = parser.parse_args()
+
+    n_chunks, n_terms = write_corpus(build_chunks(), args.out)
+    print(f"✅ Wrote {args.out}: {n_chunks} chunks, {n_terms} terms "
+          f"({os.path.getsize(args.out)} bytes)")
@@ -0,0 +1,180 @@
+"""
+Offline evaluation harness.
+
+Runs a golden question set through KeralaAyurvedaRAG in parallel worker
+processes and reports answer fidelity (recall@k, citation accuracy,
+refusal accuracy) next to throughput and latency percentiles.
+recall@k is measured on the chunks the answer path itself retrieved, so it
+only covers items routed to hybrid retrieval; items answered by the
+catalog fast path are counted separately:
+
+    python -m src.evaluation [--golden eval/golden_set.jsonl] [--workers 2] [--top-k 5]
+
+Golden set format: one JSON object per line with
+    id, query, expected_refusal (bool),
+    expected_citations: [{"doc_id": ..., "section_id": ...}, ...]
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing as mp
+import os
+import threading
+import time
+
+GOLDEN_PATH = os.path.join("eval", "golden_set.jsonl")
+
+# How long the harness waits for every worker to finish loading the RAG
+WORKER_START_TIMEOUT = 600
+
+_rag = None
+
+
+def load_golden_set(path=GOLDEN_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _init_worker(ready, errors):
+    """
+    Build one RAG instance per worker, then wait until all are ready.
+    On failure the error is reported and the barrier broken so the
+    harness stops at once instead of waiting for the timeout.
+    """
+    global _rag
+    try:
+        from src.rag_engine import KeralaAyurvedaRAG
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            _rag = KeralaAyurvedaRAG()
+    except Exception as e:
+        errors.put(f"{type(e).__name__}: {e}")
+        ready.abort()
+        raise
+    ready.wait(WORKER_START_TIMEOUT)
+
+
+def _run_item(args):
+    item, top_k = args
+    trace = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        response = _rag.answer_user_query(item["query"], top_k=top_k, trace=trace)
+        latency = time.perf_counter() - start
+
+    return {
+        "id": item["id"],
+        "latency": latency,
+        "route": trace["route"],
+        "refused": not response["citations"],
+        "cited": [(c["doc_id"], c["section_id"]) for c in response["citations"]],
+        "retrieved": [(c["doc_id"], c["section_id"]) for c in trace["retrieved"]],
+    }
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+def score(golden, results):
+    """Aggregate quality metrics; results must be in golden-set order."""
+    refusal_correct = 0
+    recalls = []
+    citation_scores = []
+    catalog_scores = []
+    routes = {"gate": 0, "catalog": 0, "retrieval": 0}
+
+    for item, res in zip(golden, results):
+        routes[res["route"]] += 1
+        refusal_correct += res["refused"] == item["expected_refusal"]
+        if item["expected_refusal"]:
+            continue
+
+        expected = {(c["doc_id"], c["section_id"]) for c in item["expected_citations"]}
+
+        # Only the retrieval route retrieves anything to measure
+        if res["route"] == "retrieval":
+            recalls.append(len(expected & set(res["retrieved"])) / len(expected))
+
+        # Share of cited sections that are expected; a wrong refusal scores 0
+        cited = res["cited"]
+        accuracy = sum(c in expected for c in cited) / len(cited) if cited else 0.0
+        citation_scores.append(accuracy)
+        if res["route"] == "catalog":
+            catalog_scores.append(accuracy)
+
+    def mean(xs):
+        return sum(xs) / len(xs) if xs else 0.0
+
+    return {
+        "refusal_accuracy": refusal_correct / len(golden) if golden else 0.0,
+        "recall_at_k": mean(recalls),
+        "recall_items": len(recalls),
+        "citation_accuracy": mean(citation_scores),
+        "catalog_citation_accuracy": mean(catalog_scores),
+        "routed_gate": routes["gate"],
+        "routed_catalog": routes["catalog"],
+        "routed_retrieval": routes["retrieval"],
+    }
+
+
+def evaluate(golden, workers=2, top_k=5):
+    """Run the golden set and return (per-item results, report dict)."""
+    if not golden:
+        raise ValueError("golden set is empty")
+
+    ctx = mp.get_context("spawn")
+    ready = ctx.Barrier(workers + 1)
+    errors = ctx.SimpleQueue()
+
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(ready, errors)) as pool:
+        try:
+            ready.wait(WORKER_START_TIMEOUT)
+        except threading.BrokenBarrierError:
+            reason = errors.get() if not errors.empty() else "timed out"
+            raise RuntimeError(f"evaluation worker failed to start: {reason}") from None
+
+        start = time.perf_counter()
+        results = pool.map(_run_item, [(item, top_k) for item in golden], chunksize=1)
+        wall = time.perf_counter() - start
+
+    latencies = [r["latency"] for r in results]
+    report = {
+        "queries": len(golden),
+        "workers": workers,
+        "top_k": top_k,
+        **score(golden, results),
+        "queries_per_sec": len(golden) / wall if wall else 0.0,
+        "latency_p50_ms": _percentile(latencies, 50) * 1000,
+        "latency_p95_ms": _percentile(latencies, 95) * 1000,
+        "latency_p99_ms": _percentile(latencies, 99) * 1000,
+    }
+    return results, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline evaluation harness.")
+    parser.add_argument("--golden", default=GOLDEN_PATH)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--verbose", action="store_true", help="print per-query results")
+    args = parser.parse_args()
+
+    golden = load_golden_set(args.golden)
+    print(f"🔄 Evaluating {len(golden)} queries with {args.workers} workers...")
+    results, report = evaluate(golden, workers=args.workers, top_k=args.top_k)
+
+    if args.verbose:
+        for item, res in zip(golden, results):
+            status = "refused" if res["refused"] else ", ".join(f"{d}:{s}" for d, s in res["cited"])
+            print(f"   {item['id']} {res['latency'] * 1000:8.1f} ms  [{res['route']}] {status}")
+
+    print("📊 Report")
+    for key, value in report.items():
+        print(f"   {key}: {value:.3f}" if isinstance(value, float) else f"   {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
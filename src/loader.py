@@ -1,25 +1,30 @@
 import os
-import pandas as pd
 
 DATA_DIR = "data"
 
 
-def load_markdown_files():
-    documents = []
+def iter_markdown_files():
+    """Yield markdown documents one at a time (keeps large corpora out of memory)."""
     for file in os.listdir(DATA_DIR):
         if file.endswith(".md"):
             path = os.path.join(DATA_DIR, file)
             with open(path, "r", encoding="utf-8") as f:
                 text = f.read()
-            documents.append({
+            yield {
                 "doc_id": file,
                 "type": "markdown",
                 "text": text
-            })
-    return documents
+            }
+
+
+def load_markdown_files():
+    return list(iter_markdown_files())
 
 
 def load_product_catalog():
+    # Imported here so serving from a prebuilt corpus never loads pandas
+    import pandas as pd
+
     path = os.path.join(DATA_DIR, "products_catalog.csv")
     df = pd.read_csv(path)
     records = []
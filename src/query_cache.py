@@ -0,0 +1,116 @@
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+
+class QueryCache:
+    """
+    Two-tier cache in front of HybridRetriever.retrieve.
+
+    Tier 1 (exact): normalised query string -> query embedding.
+        Skips the SentenceTransformer.encode call for repeated phrasings
+        that only differ in case / punctuation / spacing.
+    Tier 2 (semantic): recent query embeddings -> retrieval results.
+        A query whose embedding has cosine >= semantic_threshold with a
+        cached one (and the same retrieval params) reuses its results,
+        skipping BM25 and score fusion.
+
+    Both tiers hold at most max_entries items (LRU / ring buffer).
+    max_entries=0 disables the cache. All methods are thread-safe (the
+    retriever is shared across Streamlit sessions).
+    """
+
+    def __init__(self, max_entries=512, semantic_threshold=0.95):
+        self.max_entries = max_entries
+        self.semantic_threshold = semantic_threshold
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+        self._embeddings = OrderedDict()
+
+        # Ring buffer of normalised embeddings, allocated on first insert
+        self._matrix = None
+        self._params = [None] * max_entries
+        self._results = [None] * max_entries
+        self._size = 0
+        self._next = 0
+
+    @staticmethod
+    def normalise(tokens):
+        """Cache key from tokenizer output (lowercased, punctuation stripped)."""
+        return " ".join(tokens)
+
+    # -------- Tier 1: query embeddings --------
+
+    def get_embedding(self, key):
+        with self._lock:
+            emb = self._embeddings.get(key)
+            if emb is None:
+                self.counters["embedding_misses"] += 1
+                return None
+            self._embeddings.move_to_end(key)
+            self.counters["embedding_hits"] += 1
+            return emb
+
+    def put_embedding(self, key, embedding):
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._embeddings[key] = embedding
+            self._embeddings.move_to_end(key)
+            if len(self._embeddings) > self.max_entries:
+                self._embeddings.popitem(last=False)
+
+    # -------- Tier 2: near-duplicate results --------
+
+    def get_results(self, embedding, params):
+        with self._lock:
+            if not self._size:
+                self.counters["result_misses"] += 1
+                return None
+
+            sims = self._matrix[:self._size] @ embedding
+            for idx in np.argsort(sims)[::-1]:
+                if sims[idx] < self.semantic_threshold:
+                    break
+                if self._params[idx] == params:
+                    self.counters["result_hits"] += 1
+                    # Copies, so callers cannot mutate cached results
+                    return [dict(r) for r in self._results[idx]]
+
+            self.counters["result_misses"] += 1
+            return None
+
+    def put_results(self, embedding, params, results):
+        if not self.max_entries:
+            return
+        results = [dict(r) for r in results]
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros(
+                    (self.max_entries, embedding.shape[0]), dtype=np.float32
+                )
+            slot = self._next
+            self._matrix[slot] = embedding
+            self._params[slot] = params
+            self._results[slot] = results
+            self._next = (slot + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+
+    # -------- Metrics --------
+
+    def stats(self):
+        with self._lock:
+            c = Counter(self.counters)
+            size = self._size
+            matrix_bytes = 0 if self._matrix is None else self._matrix.nbytes
+        emb_total = c["embedding_hits"] + c["embedding_misses"]
+        res_total = c["result_hits"] + c["result_misses"]
+        return {
+            **c,
+            "embedding_hit_rate": c["embedding_hits"] / emb_total if emb_total else 0.0,
+            "result_hit_rate": c["result_hits"] / res_total if res_total else 0.0,
+            "entries": size,
+            "matrix_bytes": matrix_bytes,
+        }
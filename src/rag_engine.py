@@ -1,19 +1,43 @@
-from src.loader import load_all_documents
-from src.chunking import chunk_markdown_document, chunk_csv_rows
+from src.catalog_index import CatalogIndex
+from src.corpus_store import CORPUS_PATH, build_chunks, is_fresh, load_corpus
 from src.retriever import HybridRetriever
+from collections import Counter, OrderedDict
 import re
+import threading
+
+REFUSAL = "This information is not available in our internal corpus."
+
+# Queries shorter than this (after normalisation) cannot be grounded
+MIN_QUERY_CHARS = 3
+
+# Max number of answered queries kept in the in-process answer cache
+ANSWER_CACHE_SIZE = 256
 
 
 class KeralaAyurvedaRAG:
-    def __init__(self):
-        md_docs, csv_docs = load_all_documents()
+    def __init__(self, corpus_path: str = CORPUS_PATH):
+        self.retriever = self._load_retriever(corpus_path)
+        self.catalog = CatalogIndex(self.retriever.chunks)
 
-        chunks = []
-        for doc in md_docs:
-            chunks.extend(chunk_markdown_document(doc))
-        chunks.extend(chunk_csv_rows(csv_docs))
+        # Per-stage counters, see stage_stats()
+        self.stage_counters = Counter()
+        self._answer_cache = OrderedDict()
+        # One instance is shared across Streamlit sessions (st.cache_resource)
+        self._lock = threading.Lock()
 
-        self.retriever = HybridRetriever(chunks)
+    def _load_retriever(self, corpus_path: str) -> HybridRetriever:
+        """Prefer the prebuilt corpus artifact; fall back to parsing data/."""
+        if is_fresh(corpus_path):
+            try:
+                chunks, tokenizer, tokenized = load_corpus(corpus_path)
+                print(f"📦 Loaded corpus artifact {corpus_path}")
+                return HybridRetriever(
+                    chunks, tokenizer=tokenizer, tokenized_corpus=tokenized
+                )
+            except ValueError as e:
+                print(f"⚠️ Ignoring corpus artifact: {e}")
+
+        return HybridRetriever(build_chunks())
 
     # ----------------- SAFETY -----------------
 
@@ -218,7 +242,7 @@ class KeralaAyurvedaRAG:
         
         return score
 
-    def _extract_answer(self, chunk_text: str, query: str) -> list[str]:
+    def _extract_answer(self, chunk_text: str, query: str, keywords: set) -> list[str]:
         """Extract best answer sentences from chunk."""
         # Get content lines
         lines = self._extract_content_lines(chunk_text)
@@ -238,15 +262,6 @@ class KeralaAyurvedaRAG:
         if not sentences:
             return []
         
-        # Get query keywords
-        stop_words = {
-            'what', 'is', 'are', 'the', 'a', 'an', 'how', 'does', 'do',
-            'can', 'i', 'in', 'for', 'to', 'and', 'or', 'by', 'according',
-            'mean', 'means', 'kerala', 'ayurveda', 'described', 'when',
-            'out', 'of', 'common', 'traditionally', 'used'
-        }
-        keywords = set(query.lower().split()) - stop_words
-        
         # Score sentences
         scored = []
         for sent in sentences:
@@ -325,28 +340,25 @@ class KeralaAyurvedaRAG:
 
     # ----------------- ANSWER SYNTHESIS -----------------
 
-    def _synthesise_answer(self, query: str, chunks: list[dict]) -> tuple[str, list[dict]]:
+    def _synthesise_answer(self, query: str, chunks: list[dict], keywords: set) -> tuple[str, list[dict]]:
         """Create final answer from chunks."""
         
-        if self._hard_block(query):
-            return "This information is not available in our internal corpus.", []
-        
         selected = self._select_chunks(query, chunks)
         
         if not selected:
-            return "This information is not available in our internal corpus.", []
+            return REFUSAL, []
         
         all_sentences = []
         used_chunks = []
         
         for chunk in selected:
-            sentences = self._extract_answer(chunk["text"], query)
+            sentences = self._extract_answer(chunk["text"], query, keywords)
             if sentences:
                 all_sentences.extend(sentences)
                 used_chunks.append(chunk)
         
         if not all_sentences:
-            return "This information is not available in our internal corpus.", []
+            return REFUSAL, []
         
         # Deduplicate
         unique = []
@@ -365,26 +377,147 @@ class KeralaAyurvedaRAG:
         
         return answer, used_chunks
 
-    # ----------------- MAIN ENTRY -----------------
+    # ----------------- PIPELINE STAGES -----------------
 
-    def answer_user_query(self, query: str, top_k: int = 5) -> dict:
-        """Main entry point."""
-        
-        retrieved = self.retriever.retrieve(query, top_k=top_k)
-        
-        if not retrieved:
-            return {
-                "answer": "This information is not available in our internal corpus.",
-                "citations": [],
-                "mode": "offline-evaluation"
-            }
-        
-        answer, used = self._synthesise_answer(query, retrieved)
-        
+    def _normalise_query(self, query: str) -> str:
+        """Lowercase and collapse whitespace so trivially different queries share a key."""
+        return " ".join(query.lower().split())
+
+    def _refusal(self) -> dict:
+        return {
+            "answer": REFUSAL,
+            "citations": [],
+            "mode": "offline-evaluation"
+        }
+
+    def _format_answer(self, answer: str, used: list[dict]) -> dict:
         citations = " ".join(f"({c['doc_id']}: {c['section_id']})" for c in used)
-        
         return {
             "answer": f"Generated in offline evaluation mode.\n\n{answer}\n\n{citations}",
             "citations": used,
             "mode": "offline-evaluation"
-        }
\ No newline at end of file
+        }
+
+    def _pre_retrieval_gate(self, query: str, cache_key) -> dict | None:
+        """
+        Cheap checks that run before retrieval.
+        Returns a final response if the query can be answered (or refused)
+        without touching the retriever, otherwise None.
+        """
+        # Safety block - refused queries never need retrieval
+        if self._hard_block(query):
+            self._count("blocked_safety")
+            return self._refusal()
+
+        # Empty / too short to ground anything
+        if len(cache_key[0]) < MIN_QUERY_CHARS:
+            self._count("blocked_short")
+            return self._refusal()
+
+        # Previously answered
+        with self._lock:
+            cached = self._answer_cache.get(cache_key)
+            if cached is not None:
+                self._answer_cache.move_to_end(cache_key)
+                self.stage_counters["answer_cache_hit"] += 1
+        if cached is not None:
+            return self._copy_response(cached)
+
+        return None
+
+    def _count(self, stage: str) -> None:
+        with self._lock:
+            self.stage_counters[stage] += 1
+
+    def _copy_response(self, response: dict) -> dict:
+        """Callers get their own dicts so they cannot mutate cached entries."""
+        return {**response, "citations": [dict(c) for c in response["citations"]]}
+
+    def _store_answer(self, cache_key, response: dict) -> None:
+        response = self._copy_response(response)
+        with self._lock:
+            self._answer_cache[cache_key] = response
+            self._answer_cache.move_to_end(cache_key)
+            if len(self._answer_cache) > ANSWER_CACHE_SIZE:
+                self._answer_cache.popitem(last=False)
+
+    def stage_stats(self) -> dict:
+        """
+        Snapshot of per-stage counters.
+        retrieval_avoided counts queries answered without hybrid retrieval
+        (pre-retrieval gates and the catalog fast path).
+        """
+        with self._lock:
+            stats = dict(self.stage_counters)
+        total = stats.get("queries", 0)
+        avoided = (
+            stats.get("blocked_safety", 0) +
+            stats.get("blocked_short", 0) +
+            stats.get("answer_cache_hit", 0) +
+            stats.get("catalog_fast_path", 0)
+        )
+        stats["retrieval_avoided"] = avoided
+        stats["retrieval_avoided_ratio"] = avoided / total if total else 0.0
+        stats["query_cache"] = self.retriever.cache.stats()
+        return stats
+
+    # ----------------- MAIN ENTRY -----------------
+
+    def answer_user_query(self, query: str, top_k: int = 5, trace: dict | None = None) -> dict:
+        """
+        Main entry point.
+
+        Stages:
+          1. pre-retrieval gate (safety block, short query, answer cache)
+          2. structured catalog lookup for attribute queries
+          3. hybrid retrieval
+          4. answer synthesis
+
+        If a trace dict is passed it receives "route" (gate / catalog /
+        retrieval) and, for the retrieval route, the "retrieved" chunks.
+        """
+        if trace is None:
+            trace = {}
+        trace["route"] = "gate"
+        trace["retrieved"] = []
+
+        self._count("queries")
+        cache_key = (self._normalise_query(query), top_k)
+
+        # Stage 1: cheap gates
+        gated = self._pre_retrieval_gate(query, cache_key)
+        if gated is not None:
+            return gated
+
+        # Tokenize once; reused by catalog lookup, BM25 and keyword scoring
+        analyzed = self.retriever.tokenizer.analyze(query)
+
+        # Stage 2: catalog fast path ("which products contain Brahmi")
+        rows = self.catalog.match(query, analyzed.terms)
+        if rows is not None:
+            trace["route"] = "catalog"
+            self._count("catalog_fast_path")
+            answer, used = self.catalog.answer(rows)
+            response = self._format_answer(answer, used)
+            self._store_answer(cache_key, response)
+            return response
+
+        # Stage 3: retrieval
+        self._count("retrieval")
+        retrieved = self.retriever.retrieve(query, top_k=top_k, analyzed=analyzed)
+        trace["route"] = "retrieval"
+        trace["retrieved"] = retrieved
+        
+        if not retrieved:
+            self._count("no_results")
+            response = self._refusal()
+            self._store_answer(cache_key, response)
+            return response
+        
+        # Stage 4: synthesis
+        self._count("synthesis")
+        answer, used = self._synthesise_answer(query, retrieved, analyzed.keywords)
+        
+        response = self._format_answer(answer, used)
+        self._store_answer(cache_key, response)
+        return response
@@ -1,18 +1,34 @@
 import numpy as np
 from rank_bm25 import BM25Okapi
 from sentence_transformers import SentenceTransformer
+from src.query_cache import QueryCache
+from src.tokenizer import Tokenizer
 
 
 class HybridRetriever:
-    def __init__(self, chunks):
+    def __init__(self, chunks, tokenizer=None, tokenized_corpus=None, cache=None):
+        """
+        tokenizer and tokenized_corpus (both or neither) can be passed from
+        a prebuilt corpus artifact (see src.corpus_store) to skip
+        tokenization at startup.
+        cache defaults to a QueryCache(); pass QueryCache(max_entries=0) to disable.
+        """
         self.chunks = chunks
+        self.cache = cache if cache is not None else QueryCache()
         
         print(f"🔧 Initializing retriever with {len(chunks)} chunks")
 
         # -------- BM25 (lexical) --------
-        self.tokenized_corpus = [
-            chunk["text"].lower().split() for chunk in chunks
-        ]
+        # Interned term ids, same normalisation as query time
+        if (tokenizer is None) != (tokenized_corpus is None):
+            raise ValueError("tokenizer and tokenized_corpus must be passed together")
+        if tokenized_corpus is None:
+            tokenizer = Tokenizer()
+            tokenized_corpus = [
+                tokenizer.encode(chunk["text"], grow=True) for chunk in chunks
+            ]
+        self.tokenizer = tokenizer
+        self.tokenized_corpus = tokenized_corpus
         self.bm25 = BM25Okapi(self.tokenized_corpus)
         
         print(f"✅ BM25 initialized")
@@ -37,22 +53,40 @@ class HybridRetriever:
         top_k=5,
         bm25_weight=0.3,
         semantic_weight=0.7,
-        semantic_threshold=0.15  # LOWERED from 0.20 - was still too strict
+        semantic_threshold=0.15,  # LOWERED from 0.20 - was still too strict
+        analyzed=None
     ):
         """
         Hybrid retrieval: BM25 + semantic similarity.
         Returns chunks that pass the semantic threshold.
+        Pass `analyzed` (from self.tokenizer.analyze) to reuse a query
+        that was already tokenized upstream.
         """
 
+        if analyzed is None:
+            analyzed = self.tokenizer.analyze(query)
+
+        # Query embedding (tier 1 cache: exact normalised query)
+        cache_key = self.cache.normalise(analyzed.tokens)
+        query_embedding = self.cache.get_embedding(cache_key)
+        if query_embedding is None:
+            query_embedding = self.model.encode(
+                query,
+                normalize_embeddings=True
+            )
+            self.cache.put_embedding(cache_key, query_embedding)
+
+        # Tier 2 cache: near-duplicate query with the same params
+        params = (top_k, bm25_weight, semantic_weight, semantic_threshold)
+        cached = self.cache.get_results(query_embedding, params)
+        if cached is not None:
+            print(f"\n♻️ Query: {query} - reusing {len(cached)} cached chunks")
+            return cached
+
         # BM25 scoring
-        query_tokens = query.lower().split()
-        bm25_scores = self.bm25.get_scores(query_tokens)
+        bm25_scores = self.bm25.get_scores(analyzed.ids)
 
         # Semantic scoring
-        query_embedding = self.model.encode(
-            query,
-            normalize_embeddings=True
-        )
         semantic_scores = np.dot(self.embeddings, query_embedding)
 
         # Normalize BM25 to [0, 1]
@@ -99,4 +133,5 @@ class HybridRetriever:
         for i, r in enumerate(results[:3], 1):
             print(f"   {i}. {r['doc_id']} ({r['type']}) - semantic: {r['semantic_score']:.3f}")
 
+        self.cache.put_results(query_embedding, params, results)
         return results
\ No newline at end of file
@@ -0,0 +1,128 @@
+import re
+from functools import lru_cache
+
+# Letters/digits runs - punctuation is dropped so "Vata," == "vata"
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Generic English stop words, removed from BM25 terms
+STOP_WORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'but', 'if', 'of', 'to', 'in', 'on', 'at',
+    'for', 'by', 'with', 'from', 'as', 'into', 'about', 'is', 'are', 'was',
+    'were', 'be', 'been', 'it', 'its', 'this', 'that', 'these', 'those',
+    'what', 'which', 'who', 'how', 'when', 'does', 'do', 'can', 'i', 'you',
+    'we', 'they', 'my', 'our', 'your', 'their', 'not', 'no', 'so', 'than'
+}) | frozenset({
+    # Contraction pieces left by splitting on apostrophes ("don't" -> don, t)
+    'll', 're', 've', 'don', 'doesn', 'didn', 'isn', 'aren', 'wasn', 'weren',
+    'won', 'wouldn', 'shouldn', 'couldn', 'hasn', 'haven'
+})
+
+# Tokens shorter than this ("s" from "women's", "t" from "don't") are dropped;
+# as substrings they would match almost any sentence
+MIN_TOKEN_LEN = 2
+
+# Extra words that say nothing about the answer content in this corpus.
+# Used for sentence keyword extraction in the answer stage.
+KEYWORD_STOP_WORDS = STOP_WORDS | frozenset({
+    'according', 'mean', 'means', 'kerala', 'ayurveda', 'described',
+    'out', 'common', 'traditionally', 'used'
+})
+
+
+# Bounded so user queries cannot grow the cache without limit
+STEM_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem(token):
+    """
+    Very light suffix stripping (plurals, -ing, -ed).
+    Deliberately conservative - herb and dosha names must stay intact.
+    """
+    if len(token) <= 3:
+        return token
+    if token.endswith('sses'):
+        return token[:-2]
+    if token.endswith('ies') and len(token) > 4:
+        return token[:-3] + 'y'
+    if token.endswith('ing') and len(token) > 5:
+        return token[:-3]
+    if token.endswith('ed') and len(token) > 4:
+        return token[:-2]
+    if token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+class AnalyzedText:
+    """
+    One tokenization pass over a piece of text.
+
+    tokens   - lowercased words, punctuation stripped
+    terms    - stemmed tokens without stop words (BM25 terms)
+    ids      - vocabulary ids of known terms
+    keywords - tokens used for sentence scoring in the answer stage
+    """
+
+    __slots__ = ("text", "tokens", "terms", "ids", "keywords")
+
+    def __init__(self, text, tokens, terms, ids):
+        self.text = text
+        self.tokens = tokens
+        self.terms = terms
+        self.ids = ids
+        self.keywords = {t for t in tokens if len(t) >= MIN_TOKEN_LEN} - KEYWORD_STOP_WORDS
+
+
+class Tokenizer:
+    """
+    Shared normaliser/tokenizer for index build and query time.
+    Terms are interned into integer ids; the id lists feed BM25 directly.
+    """
+
+    def __init__(self, terms=None):
+        # terms: optional id-ordered term list (e.g. from a corpus artifact)
+        self.vocab = {term: i for i, term in enumerate(terms or [])}
+
+    def terms_by_id(self):
+        """Vocabulary as a list indexed by term id."""
+        terms = [None] * len(self.vocab)
+        for term, tid in self.vocab.items():
+            terms[tid] = term
+        return terms
+
+    def tokens(self, text):
+        return _TOKEN_RE.findall(text.lower())
+
+    def terms(self, tokens):
+        return [
+            stem(tok) for tok in tokens
+            if len(tok) >= MIN_TOKEN_LEN and tok not in STOP_WORDS
+        ]
+
+    def encode(self, text, grow=False):
+        """
+        Return term ids for text.
+        With grow=True unseen terms are added to the vocabulary (index build);
+        at query time unknown terms are dropped since they score 0 in BM25.
+        """
+        terms = self.terms(self.tokens(text))
+        return self._ids(terms, grow)
+
+    def _ids(self, terms, grow):
+        vocab = self.vocab
+        ids = []
+        for term in terms:
+            tid = vocab.get(term)
+            if tid is None:
+                if not grow:
+                    continue
+                tid = vocab[term] = len(vocab)
+            ids.append(tid)
+        return ids
+
+    def analyze(self, text):
+        """Tokenize a query once; the result is reused by every stage."""
+        tokens = self.tokens(text)
+        terms = self.terms(tokens)
+        return AnalyzedText(text, tokens, terms, self._ids(terms, grow=False))